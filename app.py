@@ -1,24 +1,31 @@
-from flask import Flask, render_template, request, jsonify, redirect, url_for, flash, make_response
+from flask import Flask, render_template, request, jsonify, redirect, url_for, flash, make_response, Response, stream_with_context, abort
 from flask_login import LoginManager, login_user, logout_user, login_required, current_user
-from werkzeug.security import generate_password_hash
 from datetime import datetime, timezone, timedelta
 import os
+import base64
+import atexit
 import secrets
+import threading
+import time
+import hashlib
 import csv
 from io import StringIO
 from dotenv import load_dotenv
-import pytz
-from functools import wraps
+from zoneinfo import ZoneInfo
+from functools import wraps, lru_cache
+from sqlalchemy import select, update, delete, func, case, exists, bindparam, or_, and_
+from sqlalchemy.orm import raiseload, aliased
 
 # Import models and forms
 from models import db, User, Measurement, APIKey, MEASUREMENT_POINTS, CHART_COLORS
 from forms import LoginForm, RegistrationForm, UpdateProfileForm, ChangePasswordForm
-from utils import generate_avatar, create_chart_colors
+from utils import generate_avatar, create_chart_colors, ORJSONProvider
 
 # Load environment variables
 load_dotenv()
 
 app = Flask(__name__)
+app.json = ORJSONProvider(app)
 
 # Configuration
 app.config['SECRET_KEY'] = os.getenv('SECRET_KEY', secrets.token_hex(32))
@@ -27,6 +34,17 @@ app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
 app.config['WTF_CSRF_ENABLED'] = True
 app.config['PERMANENT_SESSION_LIFETIME'] = timedelta(days=7)
 
+# Connection pool sizing for server databases (SQLite keeps SQLAlchemy's own defaults)
+if not app.config['SQLALCHEMY_DATABASE_URI'].startswith('sqlite'):
+    app.config['SQLALCHEMY_ENGINE_OPTIONS'] = {
+        'pool_size': 10,
+        'max_overflow': 20,
+        'pool_timeout': 30,
+        'pool_recycle': 3600,
+        'pool_pre_ping': True,
+        'pool_use_lifo': True  # Reuse warm connections; let surplus ones idle out
+    }
+
 # Initialize extensions
 db.init_app(app)
 login_manager = LoginManager()
@@ -37,7 +55,92 @@ login_manager.login_message_category = 'info'
 
 @login_manager.user_loader
 def load_user(user_id):
-    return User.query.get(int(user_id))
+    return db.session.get(User, int(user_id))
+
+# API Key verification cache (successful verifications only). Each entry holds the
+# expiry time, the number of uses served from the cache since the last database write,
+# and the time of the latest such use. The dict is shared by request threads, so every
+# read or write goes through _api_key_lock.
+API_KEY_CACHE_TIMEOUT = 300  # Seconds
+API_KEY_FLUSH_INTERVAL = 60  # Seconds between writes of cached usage counts
+_verified_api_keys = {}
+_api_key_lock = threading.Lock()
+_last_usage_flush = time.monotonic()
+
+def _take_pending_uses(entries):
+    """Collect and reset pending uses; call with _api_key_lock held"""
+    pending = [(api_key, entry[1], entry[2]) for api_key, entry in entries if entry[1]]
+    for _, entry in entries:
+        entry[1] = 0
+    return pending
+
+def _record_pending_uses(pending):
+    """Write usage counts collected by _take_pending_uses in their own transaction"""
+    if not pending:
+        return
+    # A separate connection keeps this out of the request's unit of work
+    with db.engine.begin() as connection:
+        for api_key, uses, last_used in pending:
+            connection.execute(APIKey.usage_update(APIKey.hash_key(api_key), uses, last_used))
+
+def flush_api_key_usage():
+    """Write cached API key uses to the database, dropping expired entries"""
+    global _last_usage_flush
+    now = time.monotonic()
+    with _api_key_lock:
+        _last_usage_flush = now
+        expired = [(k, e) for k, e in _verified_api_keys.items() if e[0] <= now]
+        for api_key, _ in expired:
+            del _verified_api_keys[api_key]
+        pending = _take_pending_uses(list(_verified_api_keys.items()) + expired)
+    _record_pending_uses(pending)
+
+def verify_api_key_cached(api_key):
+    """Verify an API key, reusing recent successful verifications"""
+    now = time.monotonic()
+    with _api_key_lock:
+        entry = _verified_api_keys.get(api_key)
+        if entry and entry[0] > now:
+            entry[1] += 1
+            entry[2] = datetime.now(timezone.utc)
+            return True
+        if entry:
+            del _verified_api_keys[api_key]
+            pending = _take_pending_uses([(api_key, entry)])
+        else:
+            pending = []
+    
+    # Uses served before expiry are recorded together with this verification
+    cached_uses = pending[0][1] if pending else 0
+    if not APIKey.verify_key(api_key, uses=cached_uses + 1):
+        # The key was revoked since; its earlier cached uses still happened
+        _record_pending_uses(pending)
+        return False
+    
+    with _api_key_lock:
+        evicted = []
+        if len(_verified_api_keys) >= 256:
+            evicted = _take_pending_uses(list(_verified_api_keys.items()))
+            _verified_api_keys.clear()
+        _verified_api_keys[api_key] = [now + API_KEY_CACHE_TIMEOUT, 0, None]
+    _record_pending_uses(evicted)
+    return True
+
+@app.teardown_request
+def flush_api_key_usage_periodically(exc):
+    """Sweep the API key cache after a request once the flush interval has passed"""
+    if exc is not None or time.monotonic() - _last_usage_flush < API_KEY_FLUSH_INTERVAL:
+        return
+    try:
+        flush_api_key_usage()
+    except Exception as e:
+        app.logger.warning(f"Failed to flush API key usage: {e}")
+
+def _flush_api_key_usage_at_exit():
+    with app.app_context():
+        flush_api_key_usage()
+
+atexit.register(_flush_api_key_usage_at_exit)
 
 # API Key decorator
 def require_api_key(f):
@@ -47,22 +150,137 @@ def require_api_key(f):
         if not api_key:
             return jsonify({'error': 'API key is required'}), 401
         
-        if not APIKey.verify_key(api_key):
+        if not verify_api_key_cached(api_key):
             return jsonify({'error': 'Invalid API key'}), 401
         
         return f(*args, **kwargs)
     return decorated_function
 
+# Chart series for each underscore-joined location, including legacy spellings
+CHART_LOCATION_ALIASES = {
+    'heel': 'heel', 'in_step': 'instep', 'instep': 'instep',
+    '5th_mt': 'fifth_mt', 'fifth_mt': 'fifth_mt',
+    '3rd_mt': 'third_mt', 'third_mt': 'third_mt',
+    '1st_mt': 'first_mt', 'first_mt': 'first_mt',
+    'big_toe': 'big_toe', 'bigtoe': 'big_toe'
+}
+CHART_SERIES = frozenset({'heel', 'instep', 'fifth_mt', 'third_mt', 'first_mt', 'big_toe'})
+
+@lru_cache(maxsize=256)
+def parse_chart_point(point_name):
+    """Map a stored point name to its (foot, chart series), e.g. "Right In_Step" -> ('right', 'instep')"""
+    point_parts = point_name.lower().split()
+    if len(point_parts) < 2:
+        return None, None
+    foot = point_parts[0]  # right/left
+    location = '_'.join(point_parts[1:])
+    mapped_location = CHART_LOCATION_ALIASES.get(location, location)
+    if foot in ('right', 'left') and mapped_location in CHART_SERIES:
+        return foot, mapped_location
+    return None, None
+
+# Points reported by the current-readings cards, as (foot, card key, stored point name)
+CURRENT_READING_POINTS = [
+    (foot, point, f"{foot.title()} {label}")
+    for foot in ('right', 'left')
+    for point, label in (('heel', 'Heel'), ('instep', 'In Step'), ('5th_mt', '5th MT'),
+                         ('3rd_mt', '3rd MT'), ('1st_mt', '1st MT'), ('big_toe', 'Big Toe'))
+]
+CURRENT_READING_POINT_NAMES = [point_name for _, _, point_name in CURRENT_READING_POINTS]
+VPT_THRESHOLDS = {'5th_mt': 10, '1st_mt': 10}  # Higher threshold for metatarsals
+
+def chart_bucket_label(column, time_format):
+    """SQL expression that formats a timestamp like datetime.strftime(time_format)"""
+    dialect = db.engine.dialect.name
+    if dialect == 'postgresql':
+        pattern = time_format.replace('%m', 'MM').replace('%d', 'DD')\
+                             .replace('%H', 'HH24').replace('%M', 'MI')
+        return func.to_char(column, pattern)
+    if dialect in ('mysql', 'mariadb'):
+        return func.date_format(column, time_format.replace('%M', '%i'))
+    return func.strftime(time_format, column)
+
+# Dashboard API response cache
+DASHBOARD_CACHE_TIMEOUT = 30  # Seconds
+_dashboard_cache = {}
+
+def measurement_fingerprint(*conditions):
+    """Cheap fingerprint of the matching measurements that changes on every insert or delete"""
+    # SQLite reuses the id of a deleted newest row, so the latest timestamp is
+    # included to tell a replacement reading apart from the one it replaced
+    return tuple(db.session.execute(
+        select(func.count(Measurement.id), func.max(Measurement.id),
+               func.max(Measurement.timestamp)).where(*conditions)
+    ).one())
+
+def get_measurement_version(user_id):
+    """Fingerprint of all of a user's measurements"""
+    return measurement_fingerprint(Measurement.user_id == user_id)
+
+def cache_per_user(f):
+    @wraps(f)
+    def decorated_function(*args, **kwargs):
+        # The version keeps entries correct across worker processes, where
+        # invalidate_dashboard_cache() only reaches the local cache
+        key = (current_user.id, request.full_path, get_measurement_version(current_user.id))
+        cached = _dashboard_cache.get(key)
+        if cached and cached[0] > time.monotonic():
+            return app.response_class(cached[1], mimetype='application/json')
+        
+        response = f(*args, **kwargs)
+        if len(_dashboard_cache) >= 1024:
+            _dashboard_cache.clear()
+        _dashboard_cache[key] = (time.monotonic() + DASHBOARD_CACHE_TIMEOUT, response.get_data())
+        return response
+    return decorated_function
+
+def invalidate_dashboard_cache(user_id):
+    """Drop cached dashboard responses after a user's measurements change"""
+    for key in list(_dashboard_cache):
+        if key[0] == user_id:
+            _dashboard_cache.pop(key, None)
+
 # Timezone utility
+def utc_now():
+    """Current time as an aware UTC datetime"""
+    return datetime.now(timezone.utc)
+
+_GMT8 = ZoneInfo('Asia/Manila')  # GMT+8
+
 def convert_utc_to_gmt8(utc_datetime):
     """Convert UTC datetime to GMT+8"""
     if utc_datetime is None:
         return None
-    utc = pytz.UTC
-    gmt8 = pytz.timezone('Asia/Manila')  # GMT+8
     if utc_datetime.tzinfo is None:
-        utc_datetime = utc.localize(utc_datetime)
-    return utc_datetime.astimezone(gmt8)
+        utc_datetime = utc_datetime.replace(tzinfo=timezone.utc)
+    return utc_datetime.astimezone(_GMT8)
+
+# Template globals, registered once instead of passed on every render
+app.jinja_env.globals.update(measurement_points=MEASUREMENT_POINTS,
+                             convert_timezone=convert_utc_to_gmt8)
+
+# Ownership utility
+def get_owned_measurement_or_404(measurement_id):
+    """Get one of the current user's measurements, raising on any lazy relationship load"""
+    # Primary-key lookup can be served from the identity map without a query
+    measurement = db.session.get(Measurement, measurement_id, options=[raiseload('*')])
+    if measurement is None or measurement.user_id != current_user.id:
+        abort(404)
+    return measurement
+
+# Latest-reading utility
+def get_latest_measurements_by_point(user_id, point_names, *criteria):
+    """Get the latest measurement for each point name in a single query"""
+    ranked = select(Measurement,
+                    func.row_number().over(partition_by=Measurement.point_name,
+                                           order_by=Measurement.timestamp.desc()).label('rn'))\
+             .where(Measurement.user_id == user_id,
+                    Measurement.point_name.in_(point_names),
+                    *criteria)\
+             .subquery()
+    latest = aliased(Measurement, ranked)
+    measurements = db.session.scalars(select(latest).where(ranked.c.rn == 1)).all()
+    return {measurement.point_name: measurement for measurement in measurements}
 
 # Landing page route
 @app.route('/')
@@ -70,29 +288,27 @@ def home():
     return render_template('index.html')
 
 # Authentication routes
+AUTH_PAGE_ENDPOINTS = frozenset({'login', 'register'})
+
+@app.before_request
+def redirect_authenticated_from_auth_pages():
+    """Send signed-in users to the dashboard instead of the login/register pages"""
+    if request.endpoint in AUTH_PAGE_ENDPOINTS and current_user.is_authenticated:
+        return redirect(url_for('dashboard'))
+
 @app.route('/login', methods=['GET', 'POST'])
 def login():
-    if current_user.is_authenticated:
-        return redirect(url_for('dashboard'))
-    
     form = LoginForm()
     if form.validate_on_submit():
         user = User.query.filter_by(username=form.username.data.lower()).first()
         
         if user and user.check_password(form.password.data):
             # Update last login
-            user.last_login = datetime.now(timezone.utc)
-            
-            # Handle remember me
-            remember = form.remember_me.data
-            if remember:
-                token = user.set_remember_token()
-                # Store token in secure cookie
-                resp = make_response(redirect(url_for('dashboard')))
-                resp.set_cookie('remember_token', token, max_age=30*24*60*60, secure=True, httponly=True)
+            user.last_login = utc_now()
             
             db.session.commit()
-            login_user(user, remember=remember)
+            # Flask-Login sets the remember cookie itself
+            login_user(user, remember=form.remember_me.data)
             flash('Login successful!', 'success')
             
             # Redirect to next page or dashboard
@@ -107,9 +323,6 @@ def login():
 
 @app.route('/register', methods=['GET', 'POST'])
 def register():
-    if current_user.is_authenticated:
-        return redirect(url_for('dashboard'))
-    
     form = RegistrationForm()
     if form.validate_on_submit():
         try:
@@ -153,25 +366,35 @@ def logout():
 @app.route('/dashboard')
 @login_required
 def dashboard():
-    # Get user's recent measurements
-    recent_measurements = Measurement.query.filter_by(user_id=current_user.id)\
-                                          .order_by(Measurement.timestamp.desc())\
-                                          .limit(10).all()
+    # Half-open range for today (UTC) compares the raw column instead of date(timestamp)
+    today_start = utc_now().replace(hour=0, minute=0, second=0, microsecond=0)
+    today_end = today_start + timedelta(days=1)
+    
+    # Totals as scalar subqueries, each an index-only count, so the recent list
+    # stays a LIMIT 10 index scan instead of a window over every row
+    owned = Measurement.user_id == current_user.id
+    total = select(func.count(Measurement.id)).where(owned).scalar_subquery()
+    today = select(func.count(Measurement.id))\
+            .where(owned, Measurement.timestamp >= today_start, Measurement.timestamp < today_end)\
+            .scalar_subquery()
     
-    # Get statistics
-    total_measurements = Measurement.query.filter_by(user_id=current_user.id).count()
+    # Get user's recent measurements as column rows, with both counts in the same query
+    recent_measurements = db.session.execute(
+        select(Measurement.id, Measurement.point_name, Measurement.vpt_voltage,
+               Measurement.temperature, Measurement.spo2, Measurement.timestamp,
+               total.label('total'), today.label('today'))
+        .where(owned)
+        .order_by(Measurement.timestamp.desc())
+        .limit(10)
+    ).all()
     
-    # Get today's measurements count
-    today = datetime.now(timezone.utc).date()
-    today_measurements = Measurement.query.filter_by(user_id=current_user.id)\
-                                         .filter(db.func.date(Measurement.timestamp) == today)\
-                                         .count()
+    total_measurements = recent_measurements[0].total if recent_measurements else 0
+    today_measurements = recent_measurements[0].today if recent_measurements else 0
     
     return render_template('dashboard/dashboard.html', 
                          recent_measurements=recent_measurements,
                          total_measurements=total_measurements,
-                         today_measurements=today_measurements,
-                         convert_timezone=convert_utc_to_gmt8)
+                         today_measurements=today_measurements)
 
 @app.route('/profile', methods=['GET', 'POST'])
 @login_required
@@ -181,7 +404,7 @@ def profile():
     # Calculate days since account creation
     days_active = 0
     if current_user.created_at:
-        days_active = (datetime.utcnow() - current_user.created_at).days
+        days_active = (utc_now().replace(tzinfo=None) - current_user.created_at).days
         if days_active < 0:
             days_active = 0
     
@@ -201,7 +424,6 @@ def profile():
             flash('Failed to update profile. Please try again.', 'danger')
     
     return render_template('dashboard/profile.html', form=form,
-                         convert_timezone=convert_utc_to_gmt8,
                          days_active=days_active)
 
 @app.route('/change-password', methods=['GET', 'POST'])
@@ -227,79 +449,99 @@ def change_password():
 @app.route('/avatar/<username>')
 def avatar(username):
     """Generate and serve user avatar"""
-    from flask import Response
-    import base64
     
-    user = User.query.filter_by(username=username).first()
-    if not user:
-        # Generate default avatar
-        avatar_data = generate_avatar(username)
+    # Only the picture column is needed; avatars are keyed on the username itself
+    profile_picture = db.session.scalar(select(User.profile_picture).where(User.username == username))
+    if profile_picture and profile_picture.startswith('data:image'):
+        avatar_data = profile_picture
     else:
-        if not user.profile_picture:
-            # Generate and save avatar
-            avatar_data = generate_avatar(user.username)
-            user.profile_picture = avatar_data
-            db.session.commit()
-        else:
-            # Check if it's already base64 data
-            if user.profile_picture.startswith('data:image'):
-                avatar_data = user.profile_picture
-            else:
-                # Old format, regenerate
-                avatar_data = generate_avatar(user.username)
-                user.profile_picture = avatar_data
-                db.session.commit()
+        # Unknown user or missing/old-format picture: render in memory, never write on GET
+        avatar_data = generate_avatar(username)
     
     # Extract the base64 data from the data URL
     if avatar_data.startswith('data:image/png;base64,'):
-        base64_data = avatar_data.split(',')[1]
-        image_data = base64.b64decode(base64_data)
-        
-        return Response(
-            image_data,
-            mimetype='image/png',
-            headers={
-                'Cache-Control': 'public, max-age=3600',  # Cache for 1 hour
-                'Content-Type': 'image/png'
-            }
-        )
+        response = Response(mimetype='image/png')
+        response.set_etag(hashlib.md5(avatar_data.encode()).hexdigest())
+        # Usernames never change and avatars are fixed at registration, so the bytes
+        # behind this URL are stable; the ETag still covers revalidation after expiry
+        response.cache_control.public = True
+        response.cache_control.max_age = 31536000  # Cache for 1 year
+        response.cache_control.immutable = True
+        
+        # Answer revalidations with 304 before decoding the image
+        if request.if_none_match.contains_weak(response.get_etag()[0]):
+            response.status_code = 304
+            return response
+        
+        response.set_data(base64.b64decode(avatar_data.split(',')[1]))
+        return response
     else:
         # Fallback - return a simple response
         return Response("Avatar not available", status=404)
 
 # Data visualization routes
+MY_DATA_PER_PAGE = 200
+HISTORY_PER_PAGE = 50
+
 @app.route('/my-data')
 @login_required
 def my_data():
-    # Get user's recent measurements
-    measurements = Measurement.query.filter_by(user_id=current_user.id)\
-                                   .order_by(Measurement.timestamp.desc()).all()
+    # Keyset cursor: the (timestamp, id) of the last row on the previous page
+    before = request.args.get('before', type=datetime.fromisoformat)
+    before_id = request.args.get('before_id', type=int)
+    
+    conditions = [Measurement.user_id == current_user.id]
+    if before is not None and before_id is not None:
+        conditions.append(or_(Measurement.timestamp < before,
+                              and_(Measurement.timestamp == before, Measurement.id < before_id)))
+    
+    # Get one page of the user's measurements as plain rows of the columns the page shows;
+    # one extra row tells whether an older page exists
+    measurements = db.session.execute(
+        select(Measurement.id, Measurement.point_name, Measurement.vpt_voltage,
+               Measurement.temperature, Measurement.spo2, Measurement.timestamp)
+        .where(*conditions)
+        .order_by(Measurement.timestamp.desc(), Measurement.id.desc())
+        .limit(MY_DATA_PER_PAGE + 1)
+    ).all()
+    
+    next_cursor = None
+    if len(measurements) > MY_DATA_PER_PAGE:
+        measurements = measurements[:MY_DATA_PER_PAGE]
+        last = measurements[-1]
+        next_cursor = {'before': last.timestamp.isoformat(), 'before_id': last.id}
+    
+    total_measurements = db.session.scalar(
+        select(func.count(Measurement.id)).where(Measurement.user_id == current_user.id)
+    )
     
     return render_template('dashboard/my_data.html', 
                          measurements=measurements,
-                         measurement_points=MEASUREMENT_POINTS,
-                         convert_timezone=convert_utc_to_gmt8)
+                         total_measurements=total_measurements,
+                         next_cursor=next_cursor,
+                         is_first_page=before is None)
 
 @app.route('/history')
 @login_required
 def history():
-    # Get user's measurements grouped by date
-    measurements = Measurement.query.filter_by(user_id=current_user.id)\
-                                   .order_by(Measurement.timestamp.desc()).all()
+    # Get one page of the user's measurements, newest first
+    page = request.args.get('page', 1, type=int)
+    measurements_pagination = Measurement.query.filter_by(user_id=current_user.id)\
+                                               .options(raiseload('*'))\
+                                               .order_by(Measurement.timestamp.desc())\
+                                               .paginate(page=page, per_page=HISTORY_PER_PAGE, error_out=False)
     
     return render_template('dashboard/history.html', 
-                         measurements=measurements,
-                         convert_timezone=convert_utc_to_gmt8)
+                         measurements=measurements_pagination.items,
+                         measurements_pagination=measurements_pagination)
 
 @app.route('/measurement/<int:measurement_id>')
 @login_required
 def view_measurement(measurement_id):
-    measurement = Measurement.query.filter_by(id=measurement_id, user_id=current_user.id).first_or_404()
+    measurement = get_owned_measurement_or_404(measurement_id)
     
     return render_template('dashboard/measurement_detail.html',
-                         measurement=measurement,
-                         measurement_points=MEASUREMENT_POINTS,
-                         convert_timezone=convert_utc_to_gmt8)
+                         measurement=measurement)
 
 # API Routes for device data
 @app.route('/api/data', methods=['POST'])
@@ -340,11 +582,12 @@ def receive_data():
             vpt_voltage=data.get('vpt'),
             temperature=data.get('temp'),
             spo2=data.get('spo2'),
-            timestamp=datetime.now(timezone.utc)  # Server timestamp
+            timestamp=utc_now()  # Server timestamp
         )
         
         db.session.add(measurement)
         db.session.commit()
+        invalidate_dashboard_cache(user.id)
         
         return jsonify({
             'success': True,
@@ -361,33 +604,33 @@ def receive_data():
 @require_api_key
 def get_user_measurements(user_id):
     """Get all measurements for a user"""
-    user = User.query.get(user_id)
-    if not user:
+    if not db.session.scalar(select(exists().where(User.id == user_id))):
         return jsonify({'error': 'User not found'}), 404
     
-    measurements = Measurement.query.filter_by(user_id=user_id)\
-                                   .order_by(Measurement.timestamp.desc()).all()
+    # Plain column rows serialized like Measurement.to_dict() without ORM instances
+    rows = db.session.execute(
+        select(*(getattr(Measurement, field) for field in Measurement.SERIALIZED_FIELDS))
+        .where(Measurement.user_id == user_id)
+        .order_by(Measurement.timestamp.desc())
+    ).mappings()
     
-    return jsonify({
-        'measurements': [measurement.to_dict() for measurement in measurements]
-    })
+    return jsonify({'measurements': [Measurement.serialize(row) for row in rows]})
 
 # Dashboard API endpoints for charts and tables
 @app.route('/api/chart-data')
 @login_required
+@cache_per_user
 def get_chart_data():
     """Get chart data for VPT and vitals charts"""
     days = request.args.get('days', 7, type=int)
     
     # Calculate date range
-    end_date = datetime.now(timezone.utc)
+    end_date = utc_now()
     start_date = end_date - timedelta(days=days)
     
-    # Get user's measurements within date range
-    measurements = Measurement.query.filter_by(user_id=current_user.id)\
-                                   .filter(Measurement.timestamp >= start_date)\
-                                   .filter(Measurement.timestamp <= end_date)\
-                                   .order_by(Measurement.timestamp).all()
+    user_filter = (Measurement.user_id == current_user.id,
+                   Measurement.timestamp >= start_date,
+                   Measurement.timestamp <= end_date)
     
     # Initialize chart data structure
     chart_data = {
@@ -407,15 +650,13 @@ def get_chart_data():
     }
     
     # If we have very recent data (less than 24 hours), group by hour instead of day
-    if measurements:
-        latest_measurement = max(measurements, key=lambda x: x.timestamp)
-        
+    latest_timestamp = db.session.scalar(select(func.max(Measurement.timestamp)).where(*user_filter))
+    if latest_timestamp is not None:
         # Ensure timestamp is timezone-aware for comparison
-        latest_timestamp = latest_measurement.timestamp
         if latest_timestamp.tzinfo is None:
             latest_timestamp = latest_timestamp.replace(tzinfo=timezone.utc)
         
-        time_diff = datetime.now(timezone.utc) - latest_timestamp
+        time_diff = end_date - latest_timestamp
         if time_diff.total_seconds() < 24 * 3600:  # Less than 24 hours
             time_format = '%m/%d %H:%M'  # Include time for recent data
         else:
@@ -423,44 +664,55 @@ def get_chart_data():
     else:
         time_format = '%m/%d'
     
-    # Group measurements by time period
+    # Group measurements by time period and point in the database. Within each
+    # group, rn == 1 marks the latest reading that has a VPT value.
+    bucket = chart_bucket_label(Measurement.timestamp, time_format)
+    ranked = select(bucket.label('bucket'), Measurement.point_name, Measurement.timestamp,
+                    Measurement.vpt_voltage, Measurement.temperature, Measurement.spo2,
+                    func.row_number().over(partition_by=(bucket, Measurement.point_name),
+                                           order_by=(Measurement.vpt_voltage.is_(None),
+                                                     Measurement.timestamp.desc())).label('rn'))\
+             .where(*user_filter)\
+             .subquery()
+    latest_vpt = ranked.c.rn == 1
+    groups = db.session.execute(
+        select(ranked.c.bucket, ranked.c.point_name,
+               func.min(ranked.c.timestamp).label('first_timestamp'),
+               func.max(case((latest_vpt, ranked.c.vpt_voltage))).label('vpt'),
+               func.max(case((latest_vpt, ranked.c.timestamp))).label('vpt_timestamp'),
+               func.sum(ranked.c.temperature).label('temp_sum'),
+               func.count(ranked.c.temperature).label('temp_count'),
+               func.sum(ranked.c.spo2).label('spo2_sum'),
+               func.count(ranked.c.spo2).label('spo2_count'))
+        .group_by(ranked.c.bucket, ranked.c.point_name)
+    ).all()
+    
+    # Merge point groups into time periods
     time_data = {}
-    for measurement in measurements:
-        time_str = measurement.timestamp.strftime(time_format)
-        if time_str not in time_data:
-            time_data[time_str] = {
-                'timestamp': measurement.timestamp,
+    for group in groups:
+        time_values = time_data.get(group.bucket)
+        if time_values is None:
+            time_values = time_data[group.bucket] = {
+                'timestamp': group.first_timestamp,
                 'vpt': {'right': {}, 'left': {}},
-                'temp': [], 'spo2': []
+                'temp_sum': 0, 'temp_count': 0, 'spo2_sum': 0, 'spo2_count': 0
             }
+        elif group.first_timestamp < time_values['timestamp']:
+            time_values['timestamp'] = group.first_timestamp
         
-        # Parse point name (e.g., "Right Heel" -> right_heel)
-        point_parts = measurement.point_name.lower().split()
-        if len(point_parts) >= 2:
-            foot = point_parts[0]  # right/left
-            location = '_'.join(point_parts[1:]).replace(' ', '_')
+        # Look up foot and chart series (e.g., "Right Heel" -> ('right', 'heel'))
+        foot, mapped_location = parse_chart_point(group.point_name)
+        if foot:
+            if group.vpt is not None:
+                # Keep the latest value when several spellings map to the same point
+                current = time_values['vpt'][foot].get(mapped_location)
+                if current is None or group.vpt_timestamp >= current[0]:
+                    time_values['vpt'][foot][mapped_location] = (group.vpt_timestamp, group.vpt)
             
-            # Map location names
-            location_map = {
-                'heel': 'heel', 'in_step': 'instep', 'instep': 'instep',
-                '5th_mt': 'fifth_mt', 'fifth_mt': 'fifth_mt',
-                '3rd_mt': 'third_mt', 'third_mt': 'third_mt', 
-                '1st_mt': 'first_mt', 'first_mt': 'first_mt',
-                'big_toe': 'big_toe', 'bigtoe': 'big_toe'
-            }
-            
-            mapped_location = location_map.get(location, location)
-            
-            if foot in ['right', 'left'] and mapped_location in chart_data[f'{foot}Foot']:
-                if measurement.vpt_voltage is not None:
-                    # Store latest value for this time period and point
-                    time_data[time_str]['vpt'][foot][mapped_location] = measurement.vpt_voltage
-                
-                if measurement.temperature is not None:
-                    time_data[time_str]['temp'].append(measurement.temperature)
-                
-                if measurement.spo2 is not None:
-                    time_data[time_str]['spo2'].append(measurement.spo2)
+            time_values['temp_sum'] += group.temp_sum or 0
+            time_values['temp_count'] += group.temp_count
+            time_values['spo2_sum'] += group.spo2_sum or 0
+            time_values['spo2_count'] += group.spo2_count
     
     # Convert to chart format (sort by timestamp, not string)
     sorted_time_data = sorted(time_data.items(), key=lambda x: x[1]['timestamp'])
@@ -472,17 +724,17 @@ def get_chart_data():
         
         # Add VPT data for right foot
         for point in ['heel', 'instep', 'fifth_mt', 'third_mt', 'first_mt', 'big_toe']:
-            value = time_values['vpt']['right'].get(point, None)
-            chart_data['rightFoot'][point].append(value)
+            value = time_values['vpt']['right'].get(point)
+            chart_data['rightFoot'][point].append(value[1] if value else None)
             
         # Add VPT data for left foot
         for point in ['heel', 'instep', 'fifth_mt', 'third_mt', 'first_mt', 'big_toe']:
-            value = time_values['vpt']['left'].get(point, None)
-            chart_data['leftFoot'][point].append(value)
+            value = time_values['vpt']['left'].get(point)
+            chart_data['leftFoot'][point].append(value[1] if value else None)
         
         # Add vitals data (average for the time period)
-        avg_temp = sum(time_values['temp']) / len(time_values['temp']) if time_values['temp'] else None
-        avg_spo2 = sum(time_values['spo2']) / len(time_values['spo2']) if time_values['spo2'] else None
+        avg_temp = time_values['temp_sum'] / time_values['temp_count'] if time_values['temp_count'] else None
+        avg_spo2 = time_values['spo2_sum'] / time_values['spo2_count'] if time_values['spo2_count'] else None
         
         chart_data['vitals']['temperature'].append(avg_temp)
         chart_data['vitals']['spo2'].append(avg_spo2)
@@ -497,19 +749,35 @@ def get_measurement_timeline():
     point_name = request.args.get('point', None)
     
     # Calculate date range
-    end_date = datetime.now(timezone.utc)
+    end_date = utc_now()
     start_date = end_date - timedelta(days=days)
     
-    # Get user's measurements within date range
-    query = Measurement.query.filter_by(user_id=current_user.id)\
-                            .filter(Measurement.timestamp >= start_date)\
-                            .filter(Measurement.timestamp <= end_date)
+    conditions = [Measurement.user_id == current_user.id,
+                  Measurement.timestamp >= start_date,
+                  Measurement.timestamp <= end_date]
     
     # Filter by specific point if provided
     if point_name:
-        query = query.filter(Measurement.point_name == point_name)
+        conditions.append(Measurement.point_name == point_name)
     
-    measurements = query.order_by(Measurement.timestamp).all()
+    # Fingerprint the window with a cheap aggregate; unchanged data answers 304
+    fingerprint = ':'.join(map(str, measurement_fingerprint(*conditions)))
+    etag = hashlib.blake2b(fingerprint.encode(), digest_size=8).hexdigest()
+    # If-None-Match uses weak comparison; gzip proxies hand back W/"..." tags
+    if request.if_none_match.contains_weak(etag):
+        response = app.response_class(status=304)
+        response.set_etag(etag)
+        return response
+    
+    # Get user's measurements within date range (only the columns the timeline needs);
+    # the display label is formatted by the database rather than per row in Python
+    measurements = db.session.execute(
+        select(chart_bucket_label(Measurement.timestamp, '%m/%d %H:%M').label('time_str'),
+               Measurement.point_name, Measurement.vpt_voltage,
+               Measurement.temperature, Measurement.spo2)
+        .where(*conditions)
+        .order_by(Measurement.timestamp)
+    ).all()
     
     # Group by measurement point
     timeline_data = {}
@@ -524,17 +792,18 @@ def get_measurement_timeline():
                 'spo2_values': []
             }
         
-        # Format timestamp for display
-        time_str = measurement.timestamp.strftime('%m/%d %H:%M')
-        timeline_data[point]['timestamps'].append(time_str)
+        timeline_data[point]['timestamps'].append(measurement.time_str)
         timeline_data[point]['vpt_values'].append(measurement.vpt_voltage)
         timeline_data[point]['temp_values'].append(measurement.temperature)
         timeline_data[point]['spo2_values'].append(measurement.spo2)
     
-    return jsonify(timeline_data)
+    response = jsonify(timeline_data)
+    response.set_etag(etag)
+    return response
 
 @app.route('/api/current-vpt-readings')
 @login_required
+@cache_per_user
 def get_current_vpt_readings():
     """Get current VPT readings for both feet"""
     
@@ -543,50 +812,41 @@ def get_current_vpt_readings():
         'left': {}
     }
     
-    measurement_points = ['heel', 'instep', '5th_mt', '3rd_mt', '1st_mt', 'big_toe']
-    point_name_map = {
-        'heel': 'Heel', 'instep': 'In Step', '5th_mt': '5th MT', 
-        '3rd_mt': '3rd MT', '1st_mt': '1st MT', 'big_toe': 'Big Toe'
-    }
+    # Get latest VPT measurement for every point at once
+    latest_measurements = get_latest_measurements_by_point(current_user.id, CURRENT_READING_POINT_NAMES,
+                                                           Measurement.vpt_voltage.isnot(None))
     
-    for foot in ['right', 'left']:
-        for point in measurement_points:
-            point_name = f"{foot.title()} {point_name_map[point]}"
-            
-            # Get latest VPT measurement for this point
-            latest_measurement = Measurement.query.filter_by(user_id=current_user.id)\
-                                                 .filter(Measurement.point_name == point_name)\
-                                                 .filter(Measurement.vpt_voltage.isnot(None))\
-                                                 .order_by(Measurement.timestamp.desc()).first()
+    for foot, point, point_name in CURRENT_READING_POINTS:
+        latest_measurement = latest_measurements.get(point_name)
+        
+        if latest_measurement:
+            # Determine status based on voltage thresholds
+            threshold = VPT_THRESHOLDS.get(point, 5)  # Default 5V threshold
             
-            if latest_measurement:
-                # Determine status based on voltage thresholds
-                thresholds = {'5th_mt': 10, '1st_mt': 10}  # Higher threshold for metatarsals
-                threshold = thresholds.get(point, 5)  # Default 5V threshold
-                
-                if latest_measurement.vpt_voltage <= threshold:
-                    status = 'Normal'
-                elif latest_measurement.vpt_voltage <= threshold * 1.5:
-                    status = 'Elevated'
-                else:
-                    status = 'High'
-                
-                vpt_data[foot][point] = {
-                    'value': latest_measurement.vpt_voltage,
-                    'status': status,
-                    'time': latest_measurement.timestamp.strftime('%I:%M %p')
-                }
+            if latest_measurement.vpt_voltage <= threshold:
+                status = 'Normal'
+            elif latest_measurement.vpt_voltage <= threshold * 1.5:
+                status = 'Elevated'
             else:
-                vpt_data[foot][point] = {
-                    'value': 0,
-                    'status': 'No Data',
-                    'time': '--'
-                }
+                status = 'High'
+            
+            vpt_data[foot][point] = {
+                'value': latest_measurement.vpt_voltage,
+                'status': status,
+                'time': latest_measurement.timestamp.strftime('%I:%M %p')
+            }
+        else:
+            vpt_data[foot][point] = {
+                'value': 0,
+                'status': 'No Data',
+                'time': '--'
+            }
     
     return jsonify(vpt_data)
 
 @app.route('/api/current-vitals-readings')
 @login_required
+@cache_per_user
 def get_current_vitals_readings():
     """Get current temperature and SpO2 readings for both feet"""
     
@@ -595,53 +855,44 @@ def get_current_vitals_readings():
         'left': {}
     }
     
-    measurement_points = ['heel', 'instep', '5th_mt', '3rd_mt', '1st_mt', 'big_toe']
-    point_name_map = {
-        'heel': 'Heel', 'instep': 'In Step', '5th_mt': '5th MT', 
-        '3rd_mt': '3rd MT', '1st_mt': '1st MT', 'big_toe': 'Big Toe'
-    }
+    # Get latest measurement with both temperature and SpO2 for every point at once
+    latest_measurements = get_latest_measurements_by_point(current_user.id, CURRENT_READING_POINT_NAMES,
+                                                           Measurement.temperature.isnot(None),
+                                                           Measurement.spo2.isnot(None))
     
-    for foot in ['right', 'left']:
-        for point in measurement_points:
-            point_name = f"{foot.title()} {point_name_map[point]}"
+    for foot, point, point_name in CURRENT_READING_POINTS:
+        latest_measurement = latest_measurements.get(point_name)
+        
+        if latest_measurement:
+            temp_value = latest_measurement.temperature
+            spo2_value = latest_measurement.spo2
             
-            # Get latest measurement with both temperature and SpO2
-            latest_measurement = Measurement.query.filter_by(user_id=current_user.id)\
-                                                 .filter(Measurement.point_name == point_name)\
-                                                 .filter(Measurement.temperature.isnot(None))\
-                                                 .filter(Measurement.spo2.isnot(None))\
-                                                 .order_by(Measurement.timestamp.desc()).first()
+            # Determine combined status
+            temp_normal = 36.0 <= temp_value <= 37.5
+            spo2_normal = 95 <= spo2_value <= 100
             
-            if latest_measurement:
-                temp_value = latest_measurement.temperature
-                spo2_value = latest_measurement.spo2
-                
-                # Determine combined status
-                temp_normal = 36.0 <= temp_value <= 37.5
-                spo2_normal = 95 <= spo2_value <= 100
-                
-                if temp_normal and spo2_normal:
-                    status = 'Normal'
-                elif not temp_normal and spo2_normal:
-                    status = 'Temp Abnormal'
-                elif temp_normal and not spo2_normal:
-                    status = 'SpO2 Abnormal'
-                else:
-                    status = 'Both Abnormal'
-                
-                vitals_data[foot][point] = {
-                    'temperature': temp_value,
-                    'spo2': spo2_value,
-                    'status': status,
-                    'time': latest_measurement.timestamp.strftime('%I:%M %p')
-                }
+            if temp_normal and spo2_normal:
+                status = 'Normal'
+            elif not temp_normal and spo2_normal:
+                status = 'Temp Abnormal'
+            elif temp_normal and not spo2_normal:
+                status = 'SpO2 Abnormal'
             else:
-                vitals_data[foot][point] = {
-                    'temperature': 0,
-                    'spo2': 0,
-                    'status': 'No Data',
-                    'time': '--'
-                }
+                status = 'Both Abnormal'
+            
+            vitals_data[foot][point] = {
+                'temperature': temp_value,
+                'spo2': spo2_value,
+                'status': status,
+                'time': latest_measurement.timestamp.strftime('%I:%M %p')
+            }
+        else:
+            vitals_data[foot][point] = {
+                'temperature': 0,
+                'spo2': 0,
+                'status': 'No Data',
+                'time': '--'
+            }
     
     return jsonify(vitals_data)
 
@@ -670,7 +921,7 @@ def receive_sensor_data():
         toe_name = data['toe'].strip()
         
         # Create a single measurement record with all sensor data
-        timestamp = datetime.now(timezone.utc)
+        timestamp = utc_now()
         
         measurement = Measurement(
             user_id=user.id,
@@ -683,6 +934,7 @@ def receive_sensor_data():
         db.session.add(measurement)
         
         db.session.commit()
+        invalidate_dashboard_cache(user.id)
         
         return jsonify({
             'success': True,
@@ -703,12 +955,86 @@ def receive_sensor_data():
         db.session.rollback()
         return jsonify({'error': f'Internal server error: {str(e)}'}), 500
 
+MAX_BATCH_MEASUREMENTS = 100
+
+@app.route('/api/data-json-batch-send', methods=['POST'])
+@require_api_key
+def receive_sensor_data_batch():
+    """Receive several sensor readings for one user and store them in a single transaction"""
+    try:
+        data = request.get_json()
+        
+        if not data or not isinstance(data, dict):
+            return jsonify({'error': 'No JSON data provided'}), 400
+        
+        # Validate required fields
+        for field in ['username', 'measurements']:
+            if field not in data:
+                return jsonify({'error': f'Missing required field: {field}'}), 400
+        if not isinstance(data['username'], str):
+            return jsonify({'error': 'username must be a string'}), 400
+        
+        readings = data['measurements']
+        if not isinstance(readings, list) or not readings:
+            return jsonify({'error': 'measurements must be a non-empty list'}), 400
+        if len(readings) > MAX_BATCH_MEASUREMENTS:
+            return jsonify({'error': f'At most {MAX_BATCH_MEASUREMENTS} measurements per batch'}), 400
+        
+        # Find user by username
+        user = User.query.filter_by(username=data['username']).first()
+        if not user:
+            return jsonify({'error': f'User not found: {data["username"]}'}), 404
+        
+        # Validate every reading before writing anything
+        timestamp = utc_now()
+        measurements = []
+        for index, reading in enumerate(readings):
+            if not isinstance(reading, dict):
+                return jsonify({'error': f'Measurement {index} must be an object'}), 400
+            for field in ['vpt', 'temp', 'spo2', 'toe']:
+                if field not in reading:
+                    return jsonify({'error': f'Missing required field: {field} (measurement {index})'}), 400
+            if not isinstance(reading['toe'], str):
+                return jsonify({'error': f'toe must be a string (measurement {index})'}), 400
+            
+            measurements.append(Measurement(
+                user_id=user.id,
+                point_name=reading['toe'].strip(),
+                vpt_voltage=float(reading['vpt']),
+                temperature=float(reading['temp']),
+                spo2=int(reading['spo2']),
+                timestamp=timestamp
+            ))
+        
+        # One commit for the whole batch
+        db.session.add_all(measurements)
+        db.session.commit()
+        invalidate_dashboard_cache(user.id)
+        
+        return jsonify({
+            'success': True,
+            'message': f'{len(measurements)} measurements received successfully',
+            'measurement_ids': [measurement.id for measurement in measurements],
+            'timestamp': timestamp.isoformat()
+        }), 201
+        
+    except (TypeError, ValueError) as e:
+        return jsonify({'error': f'Invalid numeric value: {str(e)}'}), 400
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'error': f'Internal server error: {str(e)}'}), 500
+
 # Initialize database
 def create_tables():
     db.create_all()
     
+    # create_all() skips existing tables, so add any indexes missing from older databases
+    for table in db.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(bind=db.engine, checkfirst=True)
+    
     # Create default API key if none exists
-    if not APIKey.query.first():
+    if not db.session.scalar(select(exists().select_from(APIKey))):
         api_key = os.getenv('API_KEY', 'LIWANAG_API_KEY_2025_SECURE_DEVICE_AUTH')
         default_key = APIKey(
             key_name='Default Device Key',
@@ -718,31 +1044,59 @@ def create_tables():
         db.session.commit()
         print(f"Default API key created: {api_key}")
 
+@app.cli.command('init-db')
+def init_db_command():
+    """Create database tables and the default API key"""
+    create_tables()
+
 # Measurement Management API Routes
+
+# Owner-scoped write statements, built once and reused from the compiled cache
+DELETE_OWNED_MEASUREMENT = delete(Measurement)\
+    .where(Measurement.id == bindparam('measurement_id'),
+           Measurement.user_id == bindparam('owner_id'))\
+    .execution_options(synchronize_session=False)
+UPDATE_OWNED_MEASUREMENT_NOTES = update(Measurement)\
+    .where(Measurement.id == bindparam('measurement_id'),
+           Measurement.user_id == bindparam('owner_id'))\
+    .values(notes=bindparam('new_notes'))\
+    .execution_options(synchronize_session=False)
+
 @app.route('/api/measurements/export')
 @login_required
 def export_measurements():
     """Export user's measurement data as CSV"""
-    measurements = Measurement.query.filter_by(user_id=current_user.id)\
-                                   .order_by(Measurement.timestamp.asc()).all()
+    stmt = select(Measurement.timestamp, Measurement.point_name, Measurement.vpt_voltage,
+                  Measurement.temperature, Measurement.spo2)\
+           .where(Measurement.user_id == current_user.id)\
+           .order_by(Measurement.timestamp.asc())\
+           .execution_options(stream_results=True, yield_per=1000)  # Server-side cursor
     
-    # Create CSV content
-    csv_content = "Timestamp,Point Name,VPT Voltage,Temperature,SpO2\n"
-    for measurement in measurements:
-        csv_content += f"{measurement.timestamp.isoformat()},{measurement.point_name},"
-        csv_content += f"{measurement.vpt_voltage},{measurement.temperature},{measurement.spo2}\n"
-    
-    response = make_response(csv_content)
-    response.headers["Content-Disposition"] = f"attachment; filename=measurements_{current_user.username}.csv"
-    response.headers["Content-type"] = "text/csv"
+    def generate():
+        # Stream the CSV in chunks of rows instead of building the whole file in memory
+        output = StringIO()
+        writer = csv.writer(output)
+        writer.writerow(['Timestamp', 'Point Name', 'VPT Voltage', 'Temperature', 'SpO2'])
+        yield output.getvalue()
+        
+        for rows in db.session.execute(stmt).partitions():
+            output.seek(0)
+            output.truncate(0)
+            writer.writerows((row.timestamp.isoformat(), row.point_name,
+                              row.vpt_voltage, row.temperature, row.spo2) for row in rows)
+            yield output.getvalue()
     
-    return response
+    return Response(
+        stream_with_context(generate()),
+        mimetype='text/csv',
+        headers={'Content-Disposition': f'attachment; filename=measurements_{current_user.username}.csv'}
+    )
 
 @app.route('/api/measurements/<int:measurement_id>/export')
 @login_required
 def export_single_measurement(measurement_id):
     """Export a single measurement as CSV"""
-    measurement = Measurement.query.filter_by(id=measurement_id, user_id=current_user.id).first_or_404()
+    measurement = get_owned_measurement_or_404(measurement_id)
     
     output = StringIO()
     writer = csv.writer(output)
@@ -773,10 +1127,13 @@ def export_single_measurement(measurement_id):
 def delete_measurement(measurement_id):
     """Delete a measurement"""
     try:
-        measurement = Measurement.query.filter_by(id=measurement_id, user_id=current_user.id).first_or_404()
-        
-        db.session.delete(measurement)
+        # Single DELETE scoped to the owner; no rows means not found
+        result = db.session.execute(DELETE_OWNED_MEASUREMENT,
+                                    {'measurement_id': measurement_id, 'owner_id': current_user.id})
         db.session.commit()
+        if result.rowcount == 0:
+            return jsonify({'success': False, 'message': 'Measurement not found'}), 404
+        invalidate_dashboard_cache(current_user.id)
         
         return jsonify({
             'success': True,
@@ -792,13 +1149,16 @@ def delete_measurement(measurement_id):
 def update_measurement_notes(measurement_id):
     """Update notes for a measurement"""
     try:
-        measurement = Measurement.query.filter_by(id=measurement_id, user_id=current_user.id).first_or_404()
-        
         data = request.get_json()
         notes = data.get('notes', '')
         
-        measurement.notes = notes
+        # Single UPDATE scoped to the owner; no rows means not found
+        result = db.session.execute(UPDATE_OWNED_MEASUREMENT_NOTES,
+                                    {'measurement_id': measurement_id, 'owner_id': current_user.id,
+                                     'new_notes': notes})
         db.session.commit()
+        if result.rowcount == 0:
+            return jsonify({'success': False, 'message': 'Measurement not found'}), 404
         
         return jsonify({
             'success': True,
@@ -817,8 +1177,7 @@ def measurements():
     measurements = Measurement.query.filter_by(user_id=current_user.id)\
                                    .order_by(Measurement.timestamp.desc()).all()
     return render_template('dashboard/measurements.html',
-                         measurements=measurements,
-                         measurement_points=MEASUREMENT_POINTS)
+                         measurements=measurements)
 
 if __name__ == '__main__':
     with app.app_context():
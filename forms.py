@@ -1,9 +1,60 @@
 from flask_wtf import FlaskForm
 from wtforms import StringField, PasswordField, SubmitField, BooleanField, SelectField
 from wtforms.validators import DataRequired, Length, EqualTo, ValidationError, Regexp
-from models import User
+from models import db, User
 import re
 
+# Field patterns, compiled once and shared by every form that uses them
+NAME_RE = re.compile(r'^[A-Za-z\s\-\']+$')
+INITIAL_RE = re.compile(r'^[A-Za-z]?$')
+USERNAME_RE = re.compile(r'^[A-Za-z0-9_.-]+$')
+
+# Password policy character classes
+_HAS_UPPER, _HAS_LOWER, _HAS_DIGIT, _HAS_SPECIAL = 1, 2, 4, 8
+_ALL_CLASSES = _HAS_UPPER | _HAS_LOWER | _HAS_DIGIT | _HAS_SPECIAL
+SPECIAL_CHARACTERS = frozenset('!@#$%^&*(),.?":{}|<>')
+
+COMMON_PASSWORDS = frozenset({'password', '12345678', 'qwerty123', 'admin123'})
+
+def password_strength_errors(password_value):
+    """List the password policy rules a password breaks, classifying characters in one pass"""
+    errors = []
+    
+    # Check length
+    if len(password_value) < 8:
+        errors.append('Password must be at least 8 characters long')
+    
+    # Record which character classes appear, stopping once all four are seen
+    seen = 0
+    for ch in password_value:
+        if 'A' <= ch <= 'Z':
+            seen |= _HAS_UPPER
+        elif 'a' <= ch <= 'z':
+            seen |= _HAS_LOWER
+        elif ch.isdecimal():
+            seen |= _HAS_DIGIT
+        elif ch in SPECIAL_CHARACTERS:
+            seen |= _HAS_SPECIAL
+        else:
+            continue
+        if seen == _ALL_CLASSES:
+            break
+    
+    if not seen & _HAS_UPPER:
+        errors.append('Password must contain at least one uppercase letter')
+    if not seen & _HAS_LOWER:
+        errors.append('Password must contain at least one lowercase letter')
+    if not seen & _HAS_DIGIT:
+        errors.append('Password must contain at least one number')
+    if not seen & _HAS_SPECIAL:
+        errors.append('Password must contain at least one special character (!@#$%^&*(),.?":{}|<>)')
+    
+    # Check for common patterns
+    if password_value.lower() in COMMON_PASSWORDS:
+        errors.append('Password is too common. Please choose a more secure password')
+    
+    return errors
+
 class LoginForm(FlaskForm):
     username = StringField('Username', validators=[
         DataRequired(message='Username is required'),
@@ -19,18 +70,18 @@ class RegistrationForm(FlaskForm):
     first_name = StringField('First Name', validators=[
         DataRequired(message='First name is required'),
         Length(min=2, max=50, message='First name must be between 2 and 50 characters'),
-        Regexp(r'^[A-Za-z\s\-\']+$', message='First name can only contain letters, spaces, hyphens, and apostrophes')
+        Regexp(NAME_RE, message='First name can only contain letters, spaces, hyphens, and apostrophes')
     ])
     
     surname = StringField('Surname', validators=[
         DataRequired(message='Surname is required'),
         Length(min=2, max=50, message='Surname must be between 2 and 50 characters'),
-        Regexp(r'^[A-Za-z\s\-\']+$', message='Surname can only contain letters, spaces, hyphens, and apostrophes')
+        Regexp(NAME_RE, message='Surname can only contain letters, spaces, hyphens, and apostrophes')
     ])
     
     middle_initial = StringField('Middle Initial', validators=[
         Length(max=1, message='Middle initial must be a single character'),
-        Regexp(r'^[A-Za-z]?$', message='Middle initial must be a letter')
+        Regexp(INITIAL_RE, message='Middle initial must be a letter')
     ])
     
     hospital_name = StringField('Hospital Name', validators=[
@@ -46,7 +97,7 @@ class RegistrationForm(FlaskForm):
     username = StringField('Username', validators=[
         DataRequired(message='Username is required'),
         Length(min=3, max=80, message='Username must be between 3 and 80 characters'),
-        Regexp(r'^[A-Za-z0-9_.-]+$', message='Username can only contain letters, numbers, underscores, dots, and hyphens')
+        Regexp(USERNAME_RE, message='Username can only contain letters, numbers, underscores, dots, and hyphens')
     ])
     
     password = PasswordField('Password', validators=[
@@ -63,39 +114,14 @@ class RegistrationForm(FlaskForm):
     
     def validate_username(self, username):
         """Check if username is unique"""
-        user = User.query.filter_by(username=username.data.lower()).first()
-        if user:
+        # EXISTS on the unique username index; no user row is loaded
+        taken = db.session.scalar(db.select(db.exists().where(User.username == username.data.lower())))
+        if taken:
             raise ValidationError('Username already exists. Please choose a different one.')
     
     def validate_password(self, password):
         """Validate password strength"""
-        password_value = password.data
-        errors = []
-        
-        # Check length
-        if len(password_value) < 8:
-            errors.append('Password must be at least 8 characters long')
-        
-        # Check for uppercase letter
-        if not re.search(r'[A-Z]', password_value):
-            errors.append('Password must contain at least one uppercase letter')
-        
-        # Check for lowercase letter
-        if not re.search(r'[a-z]', password_value):
-            errors.append('Password must contain at least one lowercase letter')
-        
-        # Check for number
-        if not re.search(r'\d', password_value):
-            errors.append('Password must contain at least one number')
-        
-        # Check for special character
-        if not re.search(r'[!@#$%^&*(),.?":{}|<>]', password_value):
-            errors.append('Password must contain at least one special character (!@#$%^&*(),.?":{}|<>)')
-        
-        # Check for common patterns
-        if password_value.lower() in ['password', '12345678', 'qwerty123', 'admin123']:
-            errors.append('Password is too common. Please choose a more secure password')
-        
+        errors = password_strength_errors(password.data)
         if errors:
             raise ValidationError(' '.join(errors))
 
@@ -103,18 +129,18 @@ class UpdateProfileForm(FlaskForm):
     first_name = StringField('First Name', validators=[
         DataRequired(message='First name is required'),
         Length(min=2, max=50, message='First name must be between 2 and 50 characters'),
-        Regexp(r'^[A-Za-z\s\-\']+$', message='First name can only contain letters, spaces, hyphens, and apostrophes')
+        Regexp(NAME_RE, message='First name can only contain letters, spaces, hyphens, and apostrophes')
     ])
     
     surname = StringField('Surname', validators=[
         DataRequired(message='Surname is required'),
         Length(min=2, max=50, message='Surname must be between 2 and 50 characters'),
-        Regexp(r'^[A-Za-z\s\-\']+$', message='Surname can only contain letters, spaces, hyphens, and apostrophes')
+        Regexp(NAME_RE, message='Surname can only contain letters, spaces, hyphens, and apostrophes')
     ])
     
     middle_initial = StringField('Middle Initial', validators=[
         Length(max=1, message='Middle initial must be a single character'),
-        Regexp(r'^[A-Za-z]?$', message='Middle initial must be a letter')
+        Regexp(INITIAL_RE, message='Middle initial must be a letter')
     ])
     
     hospital_name = StringField('Hospital Name', validators=[
@@ -148,32 +174,6 @@ class ChangePasswordForm(FlaskForm):
     
     def validate_new_password(self, new_password):
         """Validate new password strength"""
-        password_value = new_password.data
-        errors = []
-        
-        # Check length
-        if len(password_value) < 8:
-            errors.append('Password must be at least 8 characters long')
-        
-        # Check for uppercase letter
-        if not re.search(r'[A-Z]', password_value):
-            errors.append('Password must contain at least one uppercase letter')
-        
-        # Check for lowercase letter
-        if not re.search(r'[a-z]', password_value):
-            errors.append('Password must contain at least one lowercase letter')
-        
-        # Check for number
-        if not re.search(r'\d', password_value):
-            errors.append('Password must contain at least one number')
-        
-        # Check for special character
-        if not re.search(r'[!@#$%^&*(),.?":{}|<>]', password_value):
-            errors.append('Password must contain at least one special character (!@#$%^&*(),.?":{}|<>)')
-        
-        # Check for common patterns
-        if password_value.lower() in ['password', '12345678', 'qwerty123', 'admin123']:
-            errors.append('Password is too common. Please choose a more secure password')
-        
+        errors = password_strength_errors(new_password.data)
         if errors:
             raise ValidationError(' '.join(errors))
@@ -1,11 +1,13 @@
 from flask_sqlalchemy import SQLAlchemy
 from flask_login import UserMixin
+from sqlalchemy.orm import deferred
 from datetime import datetime, timezone
 import bcrypt
 import hashlib
-import secrets
+import hmac
 
-db = SQLAlchemy()
+# Keep loaded instances usable after commit so current_user is not reloaded
+db = SQLAlchemy(session_options={'expire_on_commit': False})
 
 class User(UserMixin, db.Model):
     __tablename__ = 'users'
@@ -18,7 +20,8 @@ class User(UserMixin, db.Model):
     middle_initial = db.Column(db.String(1), nullable=True)
     hospital_name = db.Column(db.String(100), nullable=False)
     hospital_room_no = db.Column(db.String(20), nullable=False)
-    profile_picture = db.Column(db.Text, nullable=True)  # Base64 encoded image
+    # Base64 encoded image; deferred so current_user and other User loads skip it
+    profile_picture = deferred(db.Column(db.Text, nullable=True))
     created_at = db.Column(db.DateTime, default=lambda: datetime.now(timezone.utc))
     last_login = db.Column(db.DateTime, nullable=True)
     is_active = db.Column(db.Boolean, default=True)
@@ -42,11 +45,6 @@ class User(UserMixin, db.Model):
         # Generate the actual avatar image as base64 data
         self.profile_picture = generate_avatar(self.username)
     
-    def set_remember_token(self):
-        """Generate and set a secure remember token"""
-        self.remember_token = secrets.token_urlsafe(32)
-        return self.remember_token
-    
     def clear_remember_token(self):
         """Clear the remember token"""
         self.remember_token = None
@@ -105,34 +103,42 @@ class Measurement(db.Model):
     @property
     def quality_score(self):
         """Calculate data quality score based on completeness and validity"""
+        return self.score_quality(self.vpt_voltage, self.temperature, self.spo2, self.is_valid)
+    
+    @staticmethod
+    def score_quality(vpt_voltage, temperature, spo2, is_valid):
+        """Quality score from raw column values, for rows loaded without the ORM"""
         score = 0
         total_fields = 3
         
-        if self.vpt_voltage is not None:
+        if vpt_voltage is not None:
             score += 1
-        if self.temperature is not None:
+        if temperature is not None:
             score += 1
-        if self.spo2 is not None:
+        if spo2 is not None:
             score += 1
         
         completeness = (score / total_fields) * 100
-        validity_bonus = 10 if self.is_valid else -20
+        validity_bonus = 10 if is_valid else -20
         
         return min(100, max(0, completeness + validity_bonus))
     
+    # Columns exposed by to_dict(); endpoints select these directly to skip ORM instances
+    SERIALIZED_FIELDS = ('id', 'user_id', 'point_name', 'vpt_voltage', 'temperature',
+                         'spo2', 'timestamp', 'notes', 'is_valid')
+    
     def to_dict(self):
         """Convert measurement to dictionary"""
+        return self.serialize({field: getattr(self, field) for field in self.SERIALIZED_FIELDS})
+    
+    @classmethod
+    def serialize(cls, values):
+        """Dictionary from SERIALIZED_FIELDS column values, such as a row mapping"""
         return {
-            'id': self.id,
-            'user_id': self.user_id,
-            'point_name': self.point_name,
-            'vpt_voltage': self.vpt_voltage,
-            'temperature': self.temperature,
-            'spo2': self.spo2,
-            'timestamp': self.timestamp.isoformat(),
-            'notes': self.notes,
-            'is_valid': self.is_valid,
-            'quality_score': self.quality_score
+            **values,
+            'timestamp': values['timestamp'].isoformat(),
+            'quality_score': cls.score_quality(values['vpt_voltage'], values['temperature'],
+                                               values['spo2'], values['is_valid'])
         }
 
 class APIKey(db.Model):
@@ -140,7 +146,7 @@ class APIKey(db.Model):
     
     id = db.Column(db.Integer, primary_key=True)
     key_name = db.Column(db.String(100), nullable=False)
-    key_hash = db.Column(db.String(255), nullable=False)
+    key_hash = db.Column(db.String(255), nullable=False, unique=True, index=True)
     is_active = db.Column(db.Boolean, default=True)
     created_at = db.Column(db.DateTime, default=lambda: datetime.now(timezone.utc))
     last_used = db.Column(db.DateTime, nullable=True)
@@ -152,16 +158,34 @@ class APIKey(db.Model):
         return hashlib.sha256(api_key.encode()).hexdigest()
     
     @classmethod
-    def verify_key(cls, api_key):
-        """Verify an API key"""
+    def verify_key(cls, api_key, uses=1):
+        """Verify an API key, recording `uses` calls against it"""
         key_hash = cls.hash_key(api_key)
-        api_key_obj = cls.query.filter_by(key_hash=key_hash, is_active=True).first()
-        if api_key_obj:
-            api_key_obj.last_used = datetime.now(timezone.utc)
-            api_key_obj.usage_count += 1
+        api_key_id, stored_hash = db.session.execute(
+            db.select(cls.id, cls.key_hash).filter_by(key_hash=key_hash, is_active=True)
+        ).first() or (None, None)
+        # Confirm the match in constant time rather than trusting the database collation
+        if api_key_id and hmac.compare_digest(stored_hash, key_hash):
+            db.session.execute(cls.usage_update(key_hash, uses))
             db.session.commit()
             return True
         return False
+    
+    @classmethod
+    def usage_update(cls, key_hash, uses, last_used=None):
+        """UPDATE statement adding `uses` to a key's usage count"""
+        # Atomic increment in one UPDATE, so concurrent workers do not lose counts
+        return (db.update(cls).where(cls.key_hash == key_hash)
+                  .values(usage_count=cls.usage_count + uses,
+                          last_used=last_used or datetime.now(timezone.utc))
+                  .execution_options(synchronize_session=False))
+
+# Composite indexes matching the per-user "newest first" access pattern.
+# On PostgreSQL the reading columns are included so exports and charts are index-only scans.
+db.Index('ix_measurements_user_timestamp', Measurement.user_id, Measurement.timestamp.desc(),
+         postgresql_include=['point_name', 'vpt_voltage', 'temperature', 'spo2'])
+db.Index('ix_measurements_user_point_timestamp', Measurement.user_id, Measurement.point_name,
+         Measurement.timestamp.desc())
 
 # Predefined measurement points
 MEASUREMENT_POINTS = {
@@ -3,18 +3,48 @@ import io
 import base64
 import hashlib
 import colorsys
+from functools import lru_cache
+from types import MappingProxyType
+import orjson
+from flask.json.provider import DefaultJSONProvider
 
+# Fonts tried in order; DejaVu Sans ships with most Linux distributions where Arial is missing
+AVATAR_FONT_FILES = ("arial.ttf", "DejaVuSans.ttf")
+
+@lru_cache(maxsize=8)
+def get_avatar_font(font_size):
+    """
+    Load the avatar font once per size, falling back to Pillow's default font
+    """
+    for font_file in AVATAR_FONT_FILES:
+        try:
+            return ImageFont.truetype(font_file, font_size)
+        except OSError:
+            continue
+    try:
+        return ImageFont.load_default()
+    except Exception:
+        return None
+
+@lru_cache(maxsize=128)
+def get_glyph_size(text, font_size):
+    """
+    Width and height of text in the avatar font, or None when no font is available
+    """
+    font = get_avatar_font(font_size)
+    if not font:
+        return None
+    bbox = font.getbbox(text)
+    return bbox[2] - bbox[0], bbox[3] - bbox[1]
+
+@lru_cache(maxsize=1024)
 def generate_avatar(username, size=64):
     """
-    Generate a 64x64 circular avatar based on username
+    Generate a 64x64 circular avatar based on username.
+    The result depends only on the arguments, so repeat calls are served from a cache.
     """
-    # Create a hash from username to get consistent colors
-    username_hash = hashlib.md5(username.encode()).hexdigest()
-    
-    # Extract RGB values from hash
-    r = int(username_hash[0:2], 16)
-    g = int(username_hash[2:4], 16) 
-    b = int(username_hash[4:6], 16)
+    # Create a 3-byte hash from username to get consistent colors, one byte per RGB channel
+    r, g, b = hashlib.blake2b(username.encode(), digest_size=3).digest()
     
     # Adjust colors to ensure good contrast and pleasant appearance
     # Convert to HSV for better color manipulation
@@ -28,33 +58,24 @@ def generate_avatar(username, size=64):
     r, g, b = colorsys.hsv_to_rgb(h, s, v)
     background_color = (int(r*255), int(g*255), int(b*255))
     
-    # Create image
-    img = Image.new('RGB', (size, size), background_color)
+    # Draw the circle straight onto a transparent canvas; the corners stay clear
+    img = Image.new('RGBA', (size, size), (0, 0, 0, 0))
     draw = ImageDraw.Draw(img)
+    draw.ellipse((0, 0, size, size), fill=background_color + (255,))
     
     # Get initials (first letter of username)
     initials = username[0].upper() if username else '?'
     
-    # Try to load a font, fallback to default if not available
-    try:
-        # You can customize the font path based on your system
-        font_size = size // 2
-        font = ImageFont.truetype("arial.ttf", font_size)
-    except:
-        try:
-            font = ImageFont.load_default()
-        except:
-            font = None
+    font = get_avatar_font(size // 2)
     
     # Calculate text color (white or dark based on background brightness)
     brightness = (background_color[0] * 299 + background_color[1] * 587 + background_color[2] * 114) / 1000
     text_color = (255, 255, 255) if brightness < 128 else (0, 0, 0)
     
     # Get text size and position
-    if font:
-        bbox = draw.textbbox((0, 0), initials, font=font)
-        text_width = bbox[2] - bbox[0]
-        text_height = bbox[3] - bbox[1]
+    text_size = get_glyph_size(initials, size // 2)
+    if text_size:
+        text_width, text_height = text_size
     else:
         text_width = size // 3
         text_height = size // 3
@@ -65,34 +86,50 @@ def generate_avatar(username, size=64):
     # Draw the initial
     draw.text((text_x, text_y), initials, fill=text_color, font=font)
     
-    # Create circular mask
-    mask = Image.new('L', (size, size), 0)
-    mask_draw = ImageDraw.Draw(mask)
-    mask_draw.ellipse((0, 0, size, size), fill=255)
-    
-    # Apply circular mask
-    circular_img = Image.new('RGBA', (size, size), (0, 0, 0, 0))
-    circular_img.paste(img, (0, 0))
-    circular_img.putalpha(mask)
-    
     # Convert to base64
     buffer = io.BytesIO()
-    circular_img.save(buffer, format='PNG')
+    img.save(buffer, format='PNG')
     img_str = base64.b64encode(buffer.getvalue()).decode()
     
     return f"data:image/png;base64,{img_str}"
 
+# Read-only so the shared palette cannot be mutated by a caller
+CHART_PALETTE = MappingProxyType({
+    'primary': '#2563eb',
+    'secondary': '#3b82f6', 
+    'success': '#10b981',
+    'warning': '#f59e0b',
+    'danger': '#ef4444',
+    'info': '#06b6d4',
+    'light': '#f1f5f9',
+    'dark': '#1e293b'
+})
+
 def create_chart_colors():
     """
-    Generate a consistent color palette for charts
+    Get the consistent color palette for charts
+    """
+    return CHART_PALETTE
+
+class ORJSONProvider(DefaultJSONProvider):
+    """
+    JSON provider that serializes with orjson, falling back to Flask's defaults
+    for types orjson does not handle natively (e.g. Decimal)
     """
-    return {
-        'primary': '#2563eb',
-        'secondary': '#3b82f6', 
-        'success': '#10b981',
-        'warning': '#f59e0b',
-        'danger': '#ef4444',
-        'info': '#06b6d4',
-        'light': '#f1f5f9',
-        'dark': '#1e293b'
-    }
+    option = orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS
+
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj, default=self.default, option=self.option).decode()
+
+    def loads(self, s, **kwargs):
+        # Hooks such as the session serializer's object_hook need the stdlib decoder
+        if kwargs:
+            return super().loads(s, **kwargs)
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(
+            orjson.dumps(obj, default=self.default, option=self.option),
+            mimetype=self.mimetype
+        )